@@ -3,23 +3,86 @@
 This module defines all HTTP endpoints for the PromptLab API, including
 CRUD operations for prompts and collections, as well as a health-check
 endpoint. CORS is enabled for all origins to allow frontend integration.
+
+Every endpoint is an ``async def``: storage is in-memory and never
+blocks, so handlers run directly on the event loop instead of being
+dispatched to the threadpool. Because no handler awaits between reading
+and writing storage, each request's storage access also runs to
+completion without interleaving, so no lock is needed.
+
+Resource IDs in paths and query strings are typed as ``UUID``, so
+malformed IDs are rejected with 422 before storage is consulted and
+differently formatted spellings of the same UUID resolve to the same
+canonical storage key. ``collection_id`` in request bodies is
+canonicalized the same way when it is checked against storage.
+
+List endpoints send a weak ``ETag`` derived from the storage write
+version and the query string, and answer ``304 Not Modified`` when a
+client's ``If-None-Match`` still matches, so polling clients skip the
+response body until something changes. List pages and single-resource
+reads are serialized by pydantic-core straight to JSON and returned as
+a ready-made response; ``response_model`` is kept on those routes for
+the OpenAPI schema only.
 """
 
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from typing import Optional
+from fastapi.responses import ORJSONResponse
+from functools import lru_cache
+from itertools import islice
+from pydantic import BaseModel
+from typing import AsyncIterator, List, Optional
+from uuid import UUID
+import secrets
+import zlib
 
 from app.models import (
-    Prompt, PromptCreate, PromptUpdate,
+    Prompt, PromptCreate, PromptBatchCreate, PromptUpdate,
     Collection, CollectionCreate,
     PromptList, CollectionList, HealthResponse,
     get_current_time
 )
-from app.storage import storage
-from app.utils import sort_prompts_by_date, filter_prompts_by_collection, search_prompts
+from app.storage import SortKey, storage
+from app.utils import decode_cursor, encode_cursor
 from app import __version__
 
 
+# Default and maximum page sizes for list endpoints
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+
+# Distinguishes ETags issued by this process from those of an earlier
+# one, whose storage version counter may have reached the same value
+_ETAG_EPOCH = secrets.token_hex(4)
+
+# Shared body-less reply for successful deletes. Returning a ready-made
+# Response skips FastAPI's serialization step, and also avoids the
+# ``content-type: application/json`` header it would otherwise attach
+# to an empty 204. It is sent as-is and must never be mutated.
+_NO_CONTENT = Response(status_code=204)
+
+# Smallest step between timestamps, used to keep a batch strictly ordered
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Prepare the application before it starts serving requests.
+
+    Builds the OpenAPI schema up front. FastAPI caches it after the
+    first build, but building it takes several milliseconds, and
+    without this that cost lands on whichever client first opens
+    ``/docs`` or ``/openapi.json``.
+
+    Args:
+        app: The application being started.
+    """
+    app.openapi()
+    yield
+
+
 app = FastAPI(
     title="PromptLab API",
     description=(
@@ -27,6 +90,9 @@ app = FastAPI(
         "[Full Documentation](https://rishinarang007.github.io/10x-engineer-project-repo/)"
     ),
     version=__version__,
+    lifespan=lifespan,
+    # orjson encodes the datetime-heavy list payloads in C
+    default_response_class=ORJSONResponse,
     swagger_ui_parameters={
         "defaultModelsExpandDepth": 1,
         "docExpansion": "list",
@@ -45,11 +111,150 @@ app.add_middleware(
 )
 
 
+# ============== Helpers ==============
+
+
+def _decode_cursor_or_400(cursor: Optional[str]) -> Optional[SortKey]:
+    """Decode an optional pagination cursor from a query parameter.
+
+    Args:
+        cursor: The raw ``cursor`` query value, or ``None``.
+
+    Returns:
+        The ``(created_at, id)`` key encoded in the cursor, or ``None``
+        if no cursor was supplied.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed.
+    """
+    if cursor is None:
+        return None
+    key = decode_cursor(cursor)
+    if key is None:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return key
+
+
+def _require_collection(collection_id: str) -> str:
+    """Ensure a prompt's ``collection_id`` references a stored collection.
+
+    Body IDs are plain strings, so they are parsed as a UUID here and
+    looked up by their canonical spelling, as path and query IDs are.
+
+    Args:
+        collection_id: The collection UUID supplied in a request body.
+
+    Returns:
+        The stored collection's own ``id`` string. Prompts keep this
+        object instead of the request's copy, so every prompt in a
+        collection shares a single string.
+
+    Raises:
+        HTTPException: 400 if no collection with the given ID exists.
+    """
+    try:
+        collection = storage.get_collection(str(UUID(collection_id)))
+    except ValueError:
+        collection = None
+    if collection is None:
+        raise HTTPException(status_code=400, detail="Collection not found")
+    return collection.id
+
+
+def _list_etag(request: Request) -> str:
+    """Build the ``ETag`` for a list response.
+
+    The tag changes whenever storage is written to, and differs between
+    query strings, so each filtered or paginated view is cached
+    separately by the client.
+
+    Args:
+        request: The incoming list request.
+
+    Returns:
+        A weak entity tag such as ``W/"1a2b3c4d-7-0e9f1a2b"``.
+    """
+    query_hash = zlib.crc32(request.url.query.encode())
+    return f'W/"{_ETAG_EPOCH}-{storage.version:x}-{query_hash:08x}"'
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    """Check whether the client already holds the current representation.
+
+    Follows RFC 9110 for ``If-None-Match``: the header may be ``*`` or
+    a comma-separated list of tags, and tags are compared weakly, so a
+    ``W/`` prefix on either side is ignored.
+
+    Args:
+        request: The incoming request.
+        etag: The entity tag of the current representation.
+
+    Returns:
+        ``True`` if the header is ``*`` or lists a tag weakly matching
+        ``etag``.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        tag.strip().removeprefix("W/") == opaque
+        for tag in if_none_match.split(",")
+    )
+
+
+def _set_cache_headers(response: Response, etag: str) -> None:
+    """Attach validator headers to a list response.
+
+    ``no-cache`` lets clients store the body but makes them revalidate
+    with ``If-None-Match`` before every reuse.
+
+    Args:
+        response: The response to modify.
+        etag: The entity tag of the response body.
+    """
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+
+
+def _json_response(model: BaseModel) -> Response:
+    """Serialize a response model to a JSON response in a single pass.
+
+    ``model_dump_json`` renders the model in pydantic-core, so FastAPI's
+    response-model validation and dict conversion are skipped entirely.
+    Only use this with models that were built from validated data.
+
+    Args:
+        model: The response model to send.
+
+    Returns:
+        Response: A 200 response with the model as its JSON body.
+    """
+    return Response(model.model_dump_json(), media_type="application/json")
+
+
+def _not_modified_response(etag: str) -> Response:
+    """Build an empty ``304 Not Modified`` response.
+
+    Args:
+        etag: The entity tag the client already holds.
+
+    Returns:
+        Response: A bodiless 304 carrying the same validator headers as
+        the full response.
+    """
+    response = Response(status_code=304)
+    _set_cache_headers(response, etag)
+    return response
+
+
 # ============== Health Check ==============
 
 
 @app.get("/health", response_model=HealthResponse)
-def health_check():
+async def health_check():
     """Return the current health status and version of the API.
 
     Returns:
@@ -63,44 +268,72 @@ def health_check():
 
 
 @app.get("/prompts", response_model=PromptList)
-def list_prompts(
-    collection_id: Optional[str] = None,
-    search: Optional[str] = None
+async def list_prompts(
+    request: Request,
+    collection_id: Optional[UUID] = None,
+    search: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
 ):
-    """List all prompts, with optional filtering and search.
+    """List prompts one page at a time, with optional filtering and search.
 
-    Retrieves every stored prompt and then optionally narrows the
-    result set by collection membership and/or a text search query.
-    Results are always sorted by creation date, newest first.
+    Prompts are read from storage newest first and narrowed by
+    collection membership and/or a text search query until ``limit``
+    matches have been collected, so building the page is bounded by the
+    page size rather than the total number of stored prompts. ``total``
+    is read from the index length; only a ``search`` makes it scan the
+    precomputed search text of the candidate prompts.
 
     Args:
         collection_id: If provided, only prompts belonging to this
             collection UUID are returned.
         search: If provided, only prompts whose title or description
             contains this substring (case-insensitive) are returned.
+        limit: Maximum number of prompts to return (1-100).
+        cursor: The ``next_cursor`` value from a previous page. If
+            omitted, the first page is returned.
 
     Returns:
-        PromptList: A JSON object with a ``prompts`` array and a
-        ``total`` count of matching prompts.
+        PromptList: A JSON object with a ``prompts`` array, the
+        ``total`` number of prompts matching the filters across all
+        pages, and a ``next_cursor``
+        that is ``null`` on the last page. An empty 304 response is
+        returned instead if ``If-None-Match`` matches the current
+        ``ETag``.
+
+    Raises:
+        HTTPException: 400 if ``cursor`` is malformed.
     """
-    prompts = storage.get_all_prompts()
+    etag = _list_etag(request)
+    if _not_modified(request, etag):
+        return _not_modified_response(etag)
 
-    # Filter by collection if specified
-    if collection_id:
-        prompts = filter_prompts_by_collection(prompts, collection_id)
+    before = _decode_cursor_or_400(cursor)
 
-    # Search if query provided
-    if search:
-        prompts = search_prompts(prompts, search)
+    # Walk the date-ordered index, filtering by collection and search
+    # query (matched against precomputed lowercase text) if specified
+    collection_key = str(collection_id) if collection_id else None
+    prompts = storage.iter_prompts_newest_first(
+        before=before, collection_id=collection_key, search=search
+    )
 
-    # Sort by date (newest first)
-    prompts = sort_prompts_by_date(prompts, descending=True)
+    # Fetch one extra match to learn whether another page exists
+    page = list(islice(prompts, limit + 1))
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        next_cursor = encode_cursor(page[-1].created_at, page[-1].id)
 
-    return PromptList(prompts=prompts, total=len(prompts))
+    total = storage.count_prompts(collection_id=collection_key, search=search)
+    response = _json_response(
+        PromptList(prompts=page, total=total, next_cursor=next_cursor)
+    )
+    _set_cache_headers(response, etag)
+    return response
 
 
 @app.get("/prompts/{prompt_id}", response_model=Prompt)
-def get_prompt(prompt_id: str):
+async def get_prompt(prompt_id: UUID):
     """Retrieve a single prompt by its unique identifier.
 
     Args:
@@ -112,16 +345,16 @@ def get_prompt(prompt_id: str):
     Raises:
         HTTPException: 404 if no prompt with the given ID exists.
     """
-    prompt = storage.get_prompt(prompt_id)
+    prompt = storage.get_prompt(str(prompt_id))
 
     if not prompt:
         raise HTTPException(status_code=404, detail="Prompt not found")
 
-    return prompt
+    return _json_response(prompt)
 
 
 @app.post("/prompts", response_model=Prompt, status_code=201)
-def create_prompt(prompt_data: PromptCreate):
+async def create_prompt(prompt_data: PromptCreate):
     """Create a new prompt.
 
     Validates that the referenced collection (if any) exists, then
@@ -139,18 +372,69 @@ def create_prompt(prompt_data: PromptCreate):
         HTTPException: 400 if ``collection_id`` is provided but does
             not match any existing collection.
     """
+    data = prompt_data.model_dump()
+
     # Validate collection exists if provided
-    if prompt_data.collection_id:
-        collection = storage.get_collection(prompt_data.collection_id)
-        if not collection:
-            raise HTTPException(status_code=400, detail="Collection not found")
+    if data["collection_id"]:
+        data["collection_id"] = _require_collection(data["collection_id"])
 
-    prompt = Prompt(**prompt_data.model_dump())
+    prompt = Prompt(**data)
     return storage.create_prompt(prompt)
 
 
+@app.post("/prompts/batch", response_model=List[Prompt], status_code=201)
+async def create_prompts(batch: PromptBatchCreate):
+    """Create several prompts in one request.
+
+    The whole batch is validated before anything is stored, so either
+    every prompt is created or none is. Prompts are created in request
+    order, and each one's ``created_at`` is strictly later than the one
+    before, so listings keep that order even when several prompts are
+    stamped within the same clock tick.
+
+    Args:
+        batch: The request body containing a ``prompts`` array of
+            ``PromptCreate`` objects.
+
+    Returns:
+        List[Prompt]: The newly created prompt resources, in request
+        order.
+
+    Raises:
+        HTTPException: 400 if any ``collection_id`` does not match an
+            existing collection.
+    """
+    # Resolve each distinct collection once for the whole batch
+    collection_ids = {
+        item.collection_id: None
+        for item in batch.prompts
+        if item.collection_id
+    }
+    for collection_id in collection_ids:
+        collection_ids[collection_id] = _require_collection(collection_id)
+
+    prompts = []
+    previous = None
+    for item in batch.prompts:
+        data = item.model_dump()
+        if data["collection_id"]:
+            data["collection_id"] = collection_ids[data["collection_id"]]
+        prompt = Prompt(**data)
+        # Nudge a timestamp that did not advance, so the index cannot
+        # fall back to ordering the batch by its random IDs
+        if previous is not None and prompt.created_at <= previous:
+            stamp = previous + _ONE_MICROSECOND
+            prompt = prompt.model_copy(
+                update={"created_at": stamp, "updated_at": stamp}
+            )
+        previous = prompt.created_at
+        prompts.append(prompt)
+
+    return storage.create_prompts(prompts)
+
+
 @app.put("/prompts/{prompt_id}", response_model=Prompt)
-def update_prompt(prompt_id: str, prompt_data: PromptUpdate):
+async def update_prompt(prompt_id: UUID, prompt_data: PromptUpdate):
     """Fully replace an existing prompt.
 
     All mutable fields are overwritten with the values from the request
@@ -170,31 +454,30 @@ def update_prompt(prompt_id: str, prompt_data: PromptUpdate):
         HTTPException: 400 if ``collection_id`` is provided but does
             not match any existing collection.
     """
-    existing = storage.get_prompt(prompt_id)
+    existing = storage.get_prompt(str(prompt_id))
     if not existing:
         raise HTTPException(status_code=404, detail="Prompt not found")
 
     # Validate collection if provided
-    if prompt_data.collection_id:
-        collection = storage.get_collection(prompt_data.collection_id)
-        if not collection:
-            raise HTTPException(status_code=400, detail="Collection not found")
+    collection_id = prompt_data.collection_id
+    if collection_id:
+        collection_id = _require_collection(collection_id)
 
     updated_prompt = Prompt(
         id=existing.id,
         title=prompt_data.title,
         content=prompt_data.content,
         description=prompt_data.description,
-        collection_id=prompt_data.collection_id,
+        collection_id=collection_id,
         created_at=existing.created_at,
         updated_at=get_current_time()
     )
 
-    return storage.update_prompt(prompt_id, updated_prompt)
+    return storage.update_prompt(existing.id, updated_prompt)
 
 
 @app.patch("/prompts/{prompt_id}", response_model=Prompt)
-def patch_prompt(prompt_id: str, prompt_data: PromptUpdate):
+async def patch_prompt(prompt_id: UUID, prompt_data: PromptUpdate):
     """Partially update an existing prompt.
 
     Only the fields explicitly included in the request body are
@@ -216,7 +499,7 @@ def patch_prompt(prompt_id: str, prompt_data: PromptUpdate):
         HTTPException: 400 if ``collection_id`` is provided but does
             not match any existing collection.
     """
-    existing = storage.get_prompt(prompt_id)
+    existing = storage.get_prompt(str(prompt_id))
     if not existing:
         raise HTTPException(status_code=404, detail="Prompt not found")
 
@@ -229,55 +512,121 @@ def patch_prompt(prompt_id: str, prompt_data: PromptUpdate):
         return existing
 
     # Validate collection if provided (and not None)
-    if "collection_id" in update_data and update_data["collection_id"] is not None:
-        collection = storage.get_collection(update_data["collection_id"])
-        if not collection:
-            raise HTTPException(status_code=400, detail="Collection not found")
+    if update_data.get("collection_id") is not None:
+        update_data["collection_id"] = _require_collection(
+            update_data["collection_id"]
+        )
+
+    # Always update the timestamp when any field is modified
+    update_data["updated_at"] = get_current_time()
 
-    # Create updated prompt with only provided fields
+    # Create updated prompt with only provided fields in a single copy
+    # (assigning updated_at afterwards costs as much as the copy itself)
     # Fields not in update_data will remain unchanged from existing prompt
     updated_prompt = existing.model_copy(update=update_data)
-    # Always update the timestamp when any field is modified
-    updated_prompt.updated_at = get_current_time()
 
-    return storage.update_prompt(prompt_id, updated_prompt)
+    return storage.update_prompt(existing.id, updated_prompt)
 
 
 @app.delete("/prompts/{prompt_id}", status_code=204)
-def delete_prompt(prompt_id: str):
+async def delete_prompt(prompt_id: UUID):
     """Delete a prompt by its unique identifier.
 
     Args:
         prompt_id: The UUID of the prompt to delete.
 
     Returns:
-        None: An empty response with HTTP 204 No Content on success.
+        Response: An empty response with HTTP 204 No Content on success.
 
     Raises:
         HTTPException: 404 if no prompt with the given ID exists.
     """
-    if not storage.delete_prompt(prompt_id):
+    if not storage.delete_prompt(str(prompt_id)):
         raise HTTPException(status_code=404, detail="Prompt not found")
-    return None
+    return _NO_CONTENT
 
 
 # ============== Collection Endpoints ==============
 
 
 @app.get("/collections", response_model=CollectionList)
-def list_collections():
-    """List all collections.
+async def list_collections(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+):
+    """List collections one page at a time, oldest first.
+
+    Args:
+        limit: Maximum number of collections to return (1-100).
+        cursor: The ``next_cursor`` value from a previous page. If
+            omitted, the first page is returned.
 
     Returns:
-        CollectionList: A JSON object with a ``collections`` array and
-        a ``total`` count.
+        CollectionList: A JSON object with a ``collections`` array, the
+        ``total`` number of stored collections, and a
+        ``next_cursor`` that is ``null`` on the last page. An empty 304
+        response is returned instead if ``If-None-Match`` matches the
+        current ``ETag``.
+
+    Raises:
+        HTTPException: 400 if ``cursor`` is malformed.
     """
-    collections = storage.get_all_collections()
-    return CollectionList(collections=collections, total=len(collections))
+    etag = _list_etag(request)
+    if _not_modified(request, etag):
+        return _not_modified_response(etag)
+
+    body = _list_collections_page(storage.version, limit, cursor)
+    response = Response(body, media_type="application/json")
+    _set_cache_headers(response, etag)
+    return response
+
+
+@lru_cache(maxsize=256)
+def _list_collections_page(
+    version: int,
+    limit: int,
+    cursor: Optional[str],
+) -> str:
+    """Build one page of collections as JSON, memoized per write version.
+
+    Collections change far less often than they are listed, so pages are
+    cached under the storage ``version`` they were built from. Any write
+    bumps the version, which makes every older entry unreachable; those
+    entries then age out of the LRU. The serialized JSON is cached
+    rather than the model, so repeated requests skip serialization too.
+
+    Args:
+        version: The storage write version. Only used as part of the
+            cache key.
+        limit: Maximum number of collections to return.
+        cursor: The ``next_cursor`` value from a previous page, or
+            ``None`` for the first page.
+
+    Returns:
+        The requested ``CollectionList`` page, serialized to JSON.
+
+    Raises:
+        HTTPException: 400 if ``cursor`` is malformed.
+    """
+    after = _decode_cursor_or_400(cursor)
+
+    collections = storage.iter_collections_oldest_first(after=after)
+    page = list(islice(collections, limit + 1))
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        next_cursor = encode_cursor(page[-1].created_at, page[-1].id)
+
+    return CollectionList(
+        collections=page,
+        total=storage.count_collections(),
+        next_cursor=next_cursor,
+    ).model_dump_json()
 
 
 @app.get("/collections/{collection_id}", response_model=Collection)
-def get_collection(collection_id: str):
+async def get_collection(collection_id: UUID):
     """Retrieve a single collection by its unique identifier.
 
     Args:
@@ -289,14 +638,14 @@ def get_collection(collection_id: str):
     Raises:
         HTTPException: 404 if no collection with the given ID exists.
     """
-    collection = storage.get_collection(collection_id)
+    collection = storage.get_collection(str(collection_id))
     if not collection:
         raise HTTPException(status_code=404, detail="Collection not found")
-    return collection
+    return _json_response(collection)
 
 
 @app.post("/collections", response_model=Collection, status_code=201)
-def create_collection(collection_data: CollectionCreate):
+async def create_collection(collection_data: CollectionCreate):
     """Create a new collection.
 
     Args:
@@ -312,7 +661,7 @@ def create_collection(collection_data: CollectionCreate):
 
 
 @app.delete("/collections/{collection_id}", status_code=204)
-def delete_collection(collection_id: str):
+async def delete_collection(collection_id: UUID):
     """Delete a collection and all of its associated prompts.
 
     First removes every prompt that belongs to the collection (to
@@ -322,21 +671,22 @@ def delete_collection(collection_id: str):
         collection_id: The UUID of the collection to delete.
 
     Returns:
-        None: An empty response with HTTP 204 No Content on success.
+        Response: An empty response with HTTP 204 No Content on success.
 
     Raises:
         HTTPException: 404 if no collection with the given ID exists.
     """
+    collection_key = str(collection_id)
+
     # Check if collection exists first
-    if not storage.get_collection(collection_id):
+    if not storage.has_collection(collection_key):
         raise HTTPException(status_code=404, detail="Collection not found")
 
     # Delete all prompts that belong to this collection to prevent orphaned references
-    prompts_to_delete = storage.get_prompts_by_collection(collection_id)
-    for prompt in prompts_to_delete:
-        storage.delete_prompt(prompt.id)
+    prompts_to_delete = storage.get_prompts_by_collection(collection_key)
+    storage.delete_prompts(prompt.id for prompt in prompts_to_delete)
 
     # Now delete the collection
-    storage.delete_collection(collection_id)
+    storage.delete_collection(collection_key)
 
-    return None
+    return _NO_CONTENT
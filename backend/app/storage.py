@@ -9,23 +9,50 @@ Attributes:
     storage: The global ``Storage`` singleton used by the API layer.
 """
 
-from typing import Dict, List, Optional
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 from app.models import Prompt, Collection
+from app.utils import prompt_search_text
+
+
+# Sort key used by the ordered indexes: ``(created_at, id)``. The ``id``
+# breaks ties between resources created within the same microsecond.
+SortKey = Tuple[datetime, str]
+
+# Above this many removals, rebuilding an ordered index in one pass is
+# cheaper than deleting keys from it one at a time.
+_REBUILD_THRESHOLD = 16
 
 
 class Storage:
     """In-memory data store for prompts and collections.
 
     Uses two dictionaries keyed by resource UUID to provide O(1) lookups
-    by ID. A single ``Storage`` instance is created at module level and
-    shared across the application.
+    by ID. Alongside each dictionary, a list of ``(created_at, id)`` keys
+    is kept in ascending order so that paginated listings can seek to a
+    cursor with ``bisect`` instead of sorting every stored resource.
+    Prompts are additionally indexed per collection so that listing or
+    deleting a collection's prompts only visits its members. A single
+    ``Storage`` instance is created at module level and shared across
+    the application.
 
     Attributes:
         _prompts: Internal dictionary mapping prompt IDs to ``Prompt``
             instances.
         _collections: Internal dictionary mapping collection IDs to
             ``Collection`` instances.
+        _prompt_order: Sort keys of every stored prompt, ascending.
+        _collection_prompt_order: Sort keys of the prompts in each
+            collection, ascending, keyed by collection ID. Uncategorized
+            prompts are not indexed here.
+        _search_text: Lowercased title and description of every stored
+            prompt, keyed by prompt ID, so searches never re-lowercase.
+        _collection_order: Sort keys of every stored collection,
+            ascending.
+        _version: Counter incremented on every write, used by callers
+            to invalidate anything derived from the stored data.
     """
 
     def __init__(self) -> None:
@@ -36,6 +63,24 @@ class Storage:
         """
         self._prompts: Dict[str, Prompt] = {}
         self._collections: Dict[str, Collection] = {}
+        self._prompt_order: List[SortKey] = []
+        self._collection_prompt_order: Dict[str, List[SortKey]] = {}
+        self._search_text: Dict[str, str] = {}
+        self._collection_order: List[SortKey] = []
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        """Return the current write version of the store.
+
+        The value changes whenever a prompt or collection is created,
+        updated, or deleted, and when the store is cleared. Two equal
+        values therefore guarantee that the stored data is unchanged.
+
+        Returns:
+            A monotonically increasing integer.
+        """
+        return self._version
 
     # ============== Prompt Operations ==============
 
@@ -51,9 +96,56 @@ class Storage:
         Returns:
             The same ``Prompt`` instance that was passed in.
         """
+        previous = self._prompts.get(prompt.id)
+        if previous is not None:
+            self._unindex_prompt(previous)
         self._prompts[prompt.id] = prompt
+        self._search_text[prompt.id] = prompt_search_text(prompt)
+        self._index_prompt(prompt)
+        self._version += 1
         return prompt
 
+    def create_prompts(self, prompts: List[Prompt]) -> List[Prompt]:
+        """Persist several new prompts in a single pass.
+
+        Equivalent to calling ``create_prompt`` for each prompt, but
+        each ordered index is updated once for the whole batch and the
+        write version is bumped only once.
+
+        Args:
+            prompts: The fully constructed ``Prompt`` instances to store.
+                Their IDs should be unique within the batch.
+
+        Returns:
+            The same list that was passed in.
+        """
+        if not prompts:
+            return prompts
+        replaced = [
+            self._prompts[prompt.id] for prompt in prompts
+            if prompt.id in self._prompts
+        ]
+        if replaced:
+            self.delete_prompts(prompt.id for prompt in replaced)
+        self._prompts.update((prompt.id, prompt) for prompt in prompts)
+        self._search_text.update(
+            (prompt.id, prompt_search_text(prompt)) for prompt in prompts
+        )
+        by_collection: Dict[str, List[SortKey]] = {}
+        for prompt in prompts:
+            if prompt.collection_id is not None:
+                by_collection.setdefault(prompt.collection_id, []).append(
+                    _sort_key(prompt)
+                )
+        _insert_keys(self._prompt_order, [_sort_key(p) for p in prompts])
+        for collection_id, keys in by_collection.items():
+            _insert_keys(
+                self._collection_prompt_order.setdefault(collection_id, []),
+                keys,
+            )
+        self._version += 1
+        return prompts
+
     def get_prompt(self, prompt_id: str) -> Optional[Prompt]:
         """Retrieve a single prompt by ID.
 
@@ -75,6 +167,77 @@ class Storage:
         """
         return list(self._prompts.values())
 
+    def iter_prompts_newest_first(
+        self,
+        before: Optional[SortKey] = None,
+        collection_id: Optional[str] = None,
+        search: Optional[str] = None,
+    ) -> Iterator[Prompt]:
+        """Iterate over stored prompts from newest to oldest.
+
+        The starting point is located with a binary search over the
+        ordered index, so callers that stop after one page only pay for
+        the prompts they actually consume. When ``collection_id`` is
+        given, only that collection's index is walked.
+
+        Args:
+            before: Optional ``(created_at, id)`` key of the last prompt
+                on the previous page. Only prompts that sort strictly
+                before it are yielded.
+            collection_id: If provided, only prompts belonging to this
+                collection are yielded.
+            search: If provided, only prompts whose title or description
+                contains this substring (case-insensitive) are yielded.
+                Matching uses the precomputed search text and behaves
+                exactly like ``utils.search_prompts``.
+
+        Yields:
+            ``Prompt`` instances ordered by ``created_at`` (then ``id``),
+            newest first.
+        """
+        if collection_id is None:
+            order = self._prompt_order
+        else:
+            order = self._collection_prompt_order.get(collection_id, [])
+        needle = search.lower() if search else None
+        end = len(order) if before is None else bisect_left(order, before)
+        for index in range(end - 1, -1, -1):
+            prompt_id = order[index][1]
+            if needle is not None and needle not in self._search_text[prompt_id]:
+                continue
+            yield self._prompts[prompt_id]
+
+    def count_prompts(
+        self,
+        collection_id: Optional[str] = None,
+        search: Optional[str] = None,
+    ) -> int:
+        """Count the stored prompts matching a filter, across all pages.
+
+        Without ``search`` this is a length lookup on the relevant
+        index. With ``search``, only the precomputed search text of the
+        candidate prompts is scanned; no ``Prompt`` is touched.
+
+        Args:
+            collection_id: If provided, only prompts belonging to this
+                collection are counted.
+            search: If provided, only prompts whose title or description
+                contains this substring (case-insensitive) are counted.
+
+        Returns:
+            The number of prompts ``iter_prompts_newest_first`` would
+            yield for the same filters with no ``before`` key.
+        """
+        if collection_id is None:
+            order = self._prompt_order
+        else:
+            order = self._collection_prompt_order.get(collection_id, [])
+        if not search:
+            return len(order)
+        needle = search.lower()
+        search_text = self._search_text
+        return sum(needle in search_text[key[1]] for key in order)
+
     def update_prompt(self, prompt_id: str, prompt: Prompt) -> Optional[Prompt]:
         """Replace an existing prompt with an updated version.
 
@@ -91,9 +254,18 @@ class Storage:
             The updated ``Prompt`` on success, or ``None`` if no prompt
             with the given ID was found.
         """
-        if prompt_id not in self._prompts:
+        existing = self._prompts.get(prompt_id)
+        if existing is None:
             return None
+        if (
+            _sort_key(existing) != _sort_key(prompt)
+            or existing.collection_id != prompt.collection_id
+        ):
+            self._unindex_prompt(existing)
+            self._index_prompt(prompt)
         self._prompts[prompt_id] = prompt
+        self._search_text[prompt_id] = prompt_search_text(prompt)
+        self._version += 1
         return prompt
 
     def delete_prompt(self, prompt_id: str) -> bool:
@@ -106,10 +278,50 @@ class Storage:
             ``True`` if the prompt existed and was deleted, ``False`` if
             no prompt with the given ID was found.
         """
-        if prompt_id in self._prompts:
-            del self._prompts[prompt_id]
-            return True
-        return False
+        prompt = self._prompts.pop(prompt_id, None)
+        if prompt is None:
+            return False
+        self._unindex_prompt(prompt)
+        del self._search_text[prompt_id]
+        self._version += 1
+        return True
+
+    def delete_prompts(self, prompt_ids: Iterable[str]) -> int:
+        """Remove several prompts from the store in a single pass.
+
+        Equivalent to calling ``delete_prompt`` for each ID, but each
+        ordered index is updated once for the whole batch and the write
+        version is bumped only once.
+
+        Args:
+            prompt_ids: The UUIDs of the prompts to delete. IDs that do
+                not exist are ignored.
+
+        Returns:
+            The number of prompts that were deleted.
+        """
+        removed = [
+            self._prompts.pop(prompt_id)
+            for prompt_id in set(prompt_ids)
+            if prompt_id in self._prompts
+        ]
+        if not removed:
+            return 0
+        by_collection: Dict[str, List[SortKey]] = {}
+        for prompt in removed:
+            del self._search_text[prompt.id]
+            if prompt.collection_id is not None:
+                by_collection.setdefault(prompt.collection_id, []).append(
+                    _sort_key(prompt)
+                )
+        _remove_keys(self._prompt_order, [_sort_key(p) for p in removed])
+        for collection_id, keys in by_collection.items():
+            order = self._collection_prompt_order[collection_id]
+            _remove_keys(order, keys)
+            if not order:
+                del self._collection_prompt_order[collection_id]
+        self._version += 1
+        return len(removed)
 
     # ============== Collection Operations ==============
 
@@ -127,7 +339,12 @@ class Storage:
         Returns:
             The same ``Collection`` instance that was passed in.
         """
+        previous = self._collections.get(collection.id)
+        if previous is not None:
+            _remove_key(self._collection_order, _sort_key(previous))
         self._collections[collection.id] = collection
+        insort(self._collection_order, _sort_key(collection))
+        self._version += 1
         return collection
 
     def get_collection(self, collection_id: str) -> Optional[Collection]:
@@ -142,6 +359,21 @@ class Storage:
         """
         return self._collections.get(collection_id)
 
+    def has_collection(self, collection_id: str) -> bool:
+        """Check whether a collection exists.
+
+        Cheaper than ``get_collection`` for callers that only need to
+        validate a reference, since no object is returned.
+
+        Args:
+            collection_id: The UUID of the collection to check.
+
+        Returns:
+            ``True`` if a collection with the given ID is stored,
+            ``False`` otherwise.
+        """
+        return collection_id in self._collections
+
     def get_all_collections(self) -> List[Collection]:
         """Retrieve every stored collection.
 
@@ -151,6 +383,34 @@ class Storage:
         """
         return list(self._collections.values())
 
+    def count_collections(self) -> int:
+        """Count every stored collection.
+
+        Returns:
+            The number of collections currently in the store.
+        """
+        return len(self._collections)
+
+    def iter_collections_oldest_first(
+        self,
+        after: Optional[SortKey] = None,
+    ) -> Iterator[Collection]:
+        """Iterate over stored collections from oldest to newest.
+
+        Args:
+            after: Optional ``(created_at, id)`` key of the last
+                collection on the previous page. Only collections that
+                sort strictly after it are yielded.
+
+        Yields:
+            ``Collection`` instances ordered by ``created_at`` (then
+            ``id``), oldest first.
+        """
+        order = self._collection_order
+        start = 0 if after is None else bisect_right(order, after)
+        for index in range(start, len(order)):
+            yield self._collections[order[index][1]]
+
     def delete_collection(self, collection_id: str) -> bool:
         """Remove a collection from the store.
 
@@ -167,39 +427,141 @@ class Storage:
             ``True`` if the collection existed and was deleted,
             ``False`` if no collection with the given ID was found.
         """
-        if collection_id in self._collections:
-            del self._collections[collection_id]
-            return True
-        return False
+        collection = self._collections.pop(collection_id, None)
+        if collection is None:
+            return False
+        _remove_key(self._collection_order, _sort_key(collection))
+        self._version += 1
+        return True
 
     def get_prompts_by_collection(self, collection_id: str) -> List[Prompt]:
         """Retrieve all prompts that belong to a specific collection.
 
-        Scans every stored prompt and returns those whose
-        ``collection_id`` matches the given value.
+        Reads the per-collection index, so only the collection's own
+        prompts are visited.
 
         Args:
             collection_id: The UUID of the target collection.
 
         Returns:
-            A list of ``Prompt`` instances belonging to the collection.
-            Returns an empty list if no prompts match.
+            A list of ``Prompt`` instances belonging to the collection,
+            oldest first. Returns an empty list if no prompts match.
         """
         return [
-            p for p in self._prompts.values()
-            if p.collection_id == collection_id
+            self._prompts[key[1]]
+            for key in self._collection_prompt_order.get(collection_id, ())
         ]
 
+    # ============== Index Maintenance ==============
+
+    def _index_prompt(self, prompt: Prompt) -> None:
+        """Add a prompt's sort key to the ordered indexes.
+
+        Args:
+            prompt: The prompt being stored.
+        """
+        key = _sort_key(prompt)
+        insort(self._prompt_order, key)
+        if prompt.collection_id is not None:
+            insort(
+                self._collection_prompt_order.setdefault(prompt.collection_id, []),
+                key,
+            )
+
+    def _unindex_prompt(self, prompt: Prompt) -> None:
+        """Remove a prompt's sort key from the ordered indexes.
+
+        Args:
+            prompt: The prompt as it is currently stored.
+        """
+        key = _sort_key(prompt)
+        _remove_key(self._prompt_order, key)
+        if prompt.collection_id is not None:
+            order = self._collection_prompt_order.get(prompt.collection_id)
+            if order is not None:
+                _remove_key(order, key)
+                if not order:
+                    del self._collection_prompt_order[prompt.collection_id]
+
     # ============== Utility ==============
 
     def clear(self) -> None:
         """Remove all prompts and collections from the store.
 
         This resets the storage to its initial empty state. Primarily
-        used by test fixtures to ensure a clean slate between tests.
+        used by test fixtures to ensure a clean slate between tests. The
+        write version keeps increasing so that results cached before the
+        reset are never mistaken for current ones.
         """
         self._prompts.clear()
         self._collections.clear()
+        self._prompt_order.clear()
+        self._collection_prompt_order.clear()
+        self._search_text.clear()
+        self._collection_order.clear()
+        self._version += 1
+
+
+def _sort_key(resource: Union[Prompt, Collection]) -> SortKey:
+    """Return the ordered-index key for a prompt or collection.
+
+    Args:
+        resource: The stored prompt or collection.
+
+    Returns:
+        The ``(created_at, id)`` tuple used by the ordered indexes.
+    """
+    return (resource.created_at, resource.id)
+
+
+def _remove_key(order: List[SortKey], key: SortKey) -> None:
+    """Remove ``key`` from an ordered index in O(log N) search time.
+
+    Args:
+        order: An ascending list of sort keys.
+        key: The key to remove. Missing keys are ignored.
+    """
+    index = bisect_left(order, key)
+    if index < len(order) and order[index] == key:
+        del order[index]
+
+
+def _insert_keys(order: List[SortKey], keys: List[SortKey]) -> None:
+    """Insert several keys into an ordered index in place.
+
+    Small batches are inserted one binary search at a time; larger ones
+    are appended and the list re-sorted, which Timsort does in close to
+    linear time because both runs are already ordered.
+
+    Args:
+        order: An ascending list of sort keys.
+        keys: The keys to insert.
+    """
+    if len(keys) > _REBUILD_THRESHOLD:
+        order.extend(keys)
+        order.sort()
+    else:
+        for key in keys:
+            insort(order, key)
+
+
+def _remove_keys(order: List[SortKey], keys: List[SortKey]) -> None:
+    """Remove several keys from an ordered index in place.
+
+    Small batches are removed one binary search at a time; larger ones
+    rebuild the list in a single pass, which is cheaper than many
+    ``del`` calls that each shift the tail of the list.
+
+    Args:
+        order: An ascending list of sort keys.
+        keys: The keys to remove. Missing keys are ignored.
+    """
+    if len(keys) > _REBUILD_THRESHOLD:
+        removed = set(keys)
+        order[:] = [key for key in order if key not in removed]
+    else:
+        for key in keys:
+            _remove_key(order, key)
 
 
 # Global storage instance
@@ -1,16 +1,31 @@
 """Utility functions for PromptLab.
 
 Pure helper functions used by the API layer for sorting, filtering,
-searching, validating, and inspecting prompts. Every function in this
-module is stateless and side-effect free.
+searching, validating, and inspecting prompts, as well as encoding the
+opaque pagination cursors returned by list endpoints. Every function in
+this module is side-effect free; the only state is the bounded memo
+cache behind ``extract_variables``, which callers cannot observe.
 """
 
+import base64
+import binascii
+import heapq
 import re
-from typing import List
+from datetime import datetime
+from functools import lru_cache
+from operator import attrgetter
+from typing import Iterable, Iterator, List, Optional, Tuple
 
 from app.models import Prompt
 
 
+# ``{{variable_name}}`` template placeholders, compiled once at import
+_VAR_RE = re.compile(r"\{\{(\w+)\}\}")
+
+# Sort key for prompts by creation date, evaluated in C
+_CREATED_AT = attrgetter("created_at")
+
+
 def sort_prompts_by_date(
     prompts: List[Prompt],
     descending: bool = True,
@@ -32,7 +47,30 @@ def sort_prompts_by_date(
         >>> sorted_prompts[0].created_at >= sorted_prompts[-1].created_at
         True
     """
-    return sorted(prompts, key=lambda p: p.created_at, reverse=descending)
+    return sorted(prompts, key=_CREATED_AT, reverse=descending)
+
+
+def newest_prompts(prompts: Iterable[Prompt], count: int) -> List[Prompt]:
+    """Return the ``count`` most recently created prompts, newest first.
+
+    Equivalent to ``sort_prompts_by_date(prompts)[:count]``, but uses a
+    bounded heap, so only ``count`` prompts are kept in order instead of
+    sorting the whole input.
+
+    Args:
+        prompts: The prompts to choose from.
+        count: The maximum number of prompts to return.
+
+    Returns:
+        A new list of at most ``count`` prompts sorted by
+        ``created_at``, newest first.
+
+    Example:
+        >>> latest = newest_prompts(prompts, 5)
+        >>> latest == sort_prompts_by_date(prompts)[:5]
+        True
+    """
+    return heapq.nlargest(count, prompts, key=_CREATED_AT)
 
 
 def filter_prompts_by_collection(
@@ -58,6 +96,29 @@ def filter_prompts_by_collection(
     return [p for p in prompts if p.collection_id == collection_id]
 
 
+def iter_prompts_by_collection(
+    prompts: Iterable[Prompt],
+    collection_id: str,
+) -> Iterator[Prompt]:
+    """Lazily filter prompts to those belonging to a specific collection.
+
+    Generator counterpart of ``filter_prompts_by_collection`` for
+    pipelines that chain further filters or stop early, so no
+    intermediate list is built.
+
+    Args:
+        prompts: Any iterable of prompts to filter.
+        collection_id: The UUID of the target collection.
+
+    Yields:
+        Each prompt whose ``collection_id`` matches the given value, in
+        the order it was received.
+    """
+    for p in prompts:
+        if p.collection_id == collection_id:
+            yield p
+
+
 def search_prompts(prompts: List[Prompt], query: str) -> List[Prompt]:
     """Search prompts by title and description (case-insensitive).
 
@@ -80,12 +141,48 @@ def search_prompts(prompts: List[Prompt], query: str) -> List[Prompt]:
         ...     for p in results)
         True
     """
+    return list(iter_search_prompts(prompts, query))
+
+
+def iter_search_prompts(prompts: Iterable[Prompt], query: str) -> Iterator[Prompt]:
+    """Lazily search prompts by title and description (case-insensitive).
+
+    Generator counterpart of ``search_prompts`` for pipelines that stop
+    consuming once a page of results has been collected.
+
+    Args:
+        prompts: Any iterable of prompts to search through.
+        query: The search term. Matching is case-insensitive.
+
+    Yields:
+        Each prompt that contains ``query`` in its title or description,
+        in the order it was received.
+    """
     query_lower = query.lower()
-    return [
-        p for p in prompts
-        if query_lower in p.title.lower()
-        or (p.description and query_lower in p.description.lower())
-    ]
+    for p in prompts:
+        if query_lower in prompt_search_text(p):
+            yield p
+
+
+def prompt_search_text(prompt: Prompt) -> str:
+    """Build the lowercased text that search queries are matched against.
+
+    The title and description are joined with a NUL separator so that a
+    query cannot match across the boundary between the two fields.
+    Storage precomputes this value for every stored prompt so searches
+    do not have to lowercase each prompt again on every request.
+
+    Args:
+        prompt: The prompt to index.
+
+    Returns:
+        The lowercased ``title`` and ``description`` joined by ``"\\0"``.
+
+    Example:
+        >>> prompt_search_text(Prompt(title="Code Review", content="..."))
+        'code review\\x00'
+    """
+    return f"{prompt.title}\0{prompt.description or ''}".lower()
 
 
 def validate_prompt_content(content: str) -> bool:
@@ -111,7 +208,9 @@ def validate_prompt_content(content: str) -> bool:
         >>> validate_prompt_content("   ")
         False
     """
-    if not content or not content.strip():
+    # Stripping can only shorten the text, so anything under 10
+    # characters fails without walking it
+    if not content or len(content) < 10:
         return False
     return len(content.strip()) >= 10
 
@@ -121,7 +220,8 @@ def extract_variables(content: str) -> List[str]:
 
     Variables follow the ``{{variable_name}}`` syntax. Only word
     characters (letters, digits, and underscores) are recognised
-    inside the braces.
+    inside the braces. Results are memoized per content string, so
+    repeated calls on the same template skip the regex scan.
 
     Args:
         content: The prompt template string to scan.
@@ -139,5 +239,86 @@ def extract_variables(content: str) -> List[str]:
         >>> extract_variables("{{x}} and {{x}} again")
         ['x', 'x']
     """
-    pattern = r"\{\{(\w+)\}\}"
-    return re.findall(pattern, content)
+    # Copy so callers may mutate the result without corrupting the cache
+    return list(_extract_variables_cached(content))
+
+
+@lru_cache(maxsize=1024)
+def _extract_variables_cached(content: str) -> Tuple[str, ...]:
+    """Return the variable names in ``content`` as an immutable tuple.
+
+    Args:
+        content: The prompt template string to scan.
+
+    Returns:
+        The names found by ``_VAR_RE``, in order of appearance.
+    """
+    return tuple(_VAR_RE.findall(content))
+
+
+def iter_variables(content: str) -> Iterator[str]:
+    """Lazily extract template variable names from prompt content.
+
+    Generator counterpart of ``extract_variables`` for callers that only
+    need to know whether a template has variables, or what the first
+    one is, without scanning the rest of the content.
+
+    Args:
+        content: The prompt template string to scan.
+
+    Yields:
+        Each variable name (without braces) in the order it appears.
+
+    Example:
+        >>> next(iter_variables("Hello {{name}}, welcome to {{place}}!"))
+        'name'
+    """
+    for match in _VAR_RE.finditer(content):
+        yield match.group(1)
+
+
+def encode_cursor(created_at: datetime, resource_id: str) -> str:
+    """Encode a resource's sort key as an opaque pagination cursor.
+
+    Args:
+        created_at: Creation timestamp of the last resource on a page.
+        resource_id: UUID of that resource.
+
+    Returns:
+        A URL-safe base64 string that ``decode_cursor`` turns back into
+        the ``(created_at, id)`` key.
+
+    Example:
+        >>> cursor = encode_cursor(datetime(2026, 1, 1), "abc-123")
+        >>> decode_cursor(cursor)
+        (datetime.datetime(2026, 1, 1, 0, 0), 'abc-123')
+    """
+    raw = f"{created_at.isoformat()}|{resource_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Optional[Tuple[datetime, str]]:
+    """Decode a pagination cursor produced by ``encode_cursor``.
+
+    Args:
+        cursor: The opaque cursor string supplied by the client.
+
+    Returns:
+        The ``(created_at, id)`` key encoded in the cursor, or ``None``
+        if the cursor is malformed. Timestamps are stored naive (UTC),
+        so a cursor carrying a timezone offset or an empty id is
+        rejected rather than compared against the stored keys.
+
+    Example:
+        >>> decode_cursor("not-a-cursor") is None
+        True
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode()
+        timestamp, resource_id = raw.split("|", 1)
+        created_at = datetime.fromisoformat(timestamp)
+    except (binascii.Error, UnicodeError, ValueError):
+        return None
+    if created_at.tzinfo is not None or not resource_id:
+        return None
+    return created_at, resource_id
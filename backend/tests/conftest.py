@@ -1,15 +1,27 @@
 """Test fixtures for PromptLab"""
 
+import itertools
+from datetime import datetime, timedelta
+
 import pytest
 from fastapi.testclient import TestClient
+from app import models
 from app.api import app
+from app.models import Prompt
 from app.storage import storage
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def client():
-    """Create a test client for the API."""
-    return TestClient(app)
+    """Create a test client for the API, shared by the whole session.
+
+    Entering the client runs the app's lifespan and keeps one event loop
+    thread alive until the session ends. Without it, TestClient starts a
+    new thread and loop for every request. Per-test isolation comes from
+    ``clear_storage``, since the client itself holds no state.
+    """
+    with TestClient(app) as test_client:
+        yield test_client
 
 
 @pytest.fixture(autouse=True)
@@ -21,8 +33,56 @@ def clear_storage():
 
 
 @pytest.fixture
+def clock(monkeypatch):
+    """Make server timestamps advance by 1 ms on every reading.
+
+    Tests that depend on timestamps differing (ordering, ``updated_at``
+    changes) use this instead of sleeping between requests.
+    """
+    ticks = itertools.count()
+    start = datetime(2026, 1, 1)
+
+    class TickingDatetime(datetime):
+        @classmethod
+        def utcnow(cls):
+            return start + timedelta(milliseconds=next(ticks))
+
+    monkeypatch.setattr(models, "datetime", TickingDatetime)
+
+
+@pytest.fixture
+def seed_prompts(clock):
+    """Return a helper that stores prompts directly, bypassing HTTP.
+
+    For tests whose subject is a read endpoint, seeding through storage
+    in one batch is much cheaper than a ``POST /prompts`` per prompt.
+    Prompts are created in the order given, each with a later
+    ``created_at`` than the one before.
+    """
+    def seed(*prompts_data):
+        return storage.create_prompts([Prompt(**data) for data in prompts_data])
+
+    return seed
+
+
+@pytest.fixture
+def created_prompt(clock, sample_prompt_data):
+    """Store the sample prompt directly and return it.
+
+    For tests whose subject is an endpoint acting on an existing prompt,
+    so only that request goes through HTTP. The prompt is timestamped by
+    the ``clock`` fixture, so later writes in the test are always newer.
+    """
+    return storage.create_prompt(Prompt(**sample_prompt_data))
+
+
+@pytest.fixture(scope="session")
 def sample_prompt_data():
-    """Sample prompt data for testing."""
+    """Sample prompt data for testing.
+
+    Shared by every test in the session. Build variants with
+    ``{**sample_prompt_data, ...}`` instead of mutating it.
+    """
     return {
         "title": "Code Review Prompt",
         "content": "Review the following code and provide feedback:\n\n{{code}}",
@@ -30,9 +90,13 @@ def sample_prompt_data():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_collection_data():
-    """Sample collection data for testing."""
+    """Sample collection data for testing.
+
+    Shared by every test in the session. Build variants with
+    ``{**sample_collection_data, ...}`` instead of mutating it.
+    """
     return {
         "name": "Development",
         "description": "Prompts for development tasks"
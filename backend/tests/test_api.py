@@ -4,8 +4,35 @@ These tests verify the API endpoints work correctly.
 Students should expand these tests significantly in Week 3.
 """
 
+import base64
+from datetime import datetime
+
 import pytest
 from fastapi.testclient import TestClient
+from app import models
+from app.models import Collection, Prompt
+from app.storage import storage
+
+
+# A well-formed UUID that is never assigned to a stored resource
+MISSING_ID = "00000000-0000-0000-0000-000000000000"
+
+# Every prompt endpoint addressed by ID, with a request body it accepts
+PROMPT_ID_REQUESTS = pytest.mark.parametrize(
+    "method,body",
+    [
+        ("GET", None),
+        ("PUT", {"title": "Title", "content": "Content"}),
+        ("PATCH", {"title": "Title"}),
+        ("DELETE", None),
+    ],
+    ids=["get", "put", "patch", "delete"],
+)
+
+# Every collection endpoint addressed by ID
+COLLECTION_ID_REQUESTS = pytest.mark.parametrize(
+    "method", ["GET", "DELETE"], ids=["get", "delete"]
+)
 
 
 class TestHealth:
@@ -25,18 +52,122 @@ class TestPrompts:
     def test_create_prompt(self, client: TestClient, sample_prompt_data):
         response = client.post("/prompts", json=sample_prompt_data)
         assert response.status_code == 201
-        data = response.json()
-        assert data["title"] == sample_prompt_data["title"]
-        assert data["content"] == sample_prompt_data["content"]
-        assert "id" in data
-        assert "created_at" in data
+        prompt = Prompt.model_validate(response.json())
+        assert prompt.title == sample_prompt_data["title"]
+        assert prompt.content == sample_prompt_data["content"]
     
-    def test_list_prompts_empty(self, client: TestClient):
-        response = client.get("/prompts")
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            {"content": "Content"},
+            {"title": "Title"},
+            {"title": "", "content": "Content"},
+            {"title": "Title", "content": ""},
+            {"title": "x" * 201, "content": "Content"},
+            {"title": "Title", "content": "Content", "description": "x" * 501},
+        ],
+        ids=["no-title", "no-content", "empty-title", "empty-content",
+             "long-title", "long-description"],
+    )
+    def test_create_prompt_invalid_payload(self, client: TestClient, payload):
+        response = client.post("/prompts", json=payload)
+        assert response.status_code == 422
+        assert storage.get_all_prompts() == []
+    
+    def test_body_collection_id_is_canonicalized(
+        self, client: TestClient, sample_prompt_data, sample_collection_data
+    ):
+        collection_id = client.post(
+            "/collections", json=sample_collection_data
+        ).json()["id"]
+        body = {**sample_prompt_data, "collection_id": collection_id.upper()}
+        
+        created = client.post("/prompts", json=body)
+        assert created.status_code == 201
+        assert created.json()["collection_id"] == collection_id
+        prompt_url = f"/prompts/{created.json()['id']}"
+        
+        batch = client.post("/prompts/batch", json={"prompts": [body]})
+        assert batch.status_code == 201
+        assert batch.json()[0]["collection_id"] == collection_id
+        
+        for method in ("PUT", "PATCH"):
+            response = client.request(method, prompt_url, json=body)
+            assert response.status_code == 200
+            assert response.json()["collection_id"] == collection_id
+    
+    def test_create_prompts_batch(self, client: TestClient, sample_collection_data):
+        collection_id = client.post(
+            "/collections", json=sample_collection_data
+        ).json()["id"]
+        batch = {"prompts": [
+            {"title": "First", "content": "One", "collection_id": collection_id},
+            {"title": "Second", "content": "Two"},
+        ]}
+
+        response = client.post("/prompts/batch", json=batch)
+        assert response.status_code == 201
+        created = response.json()
+        assert [p["title"] for p in created] == ["First", "Second"]
+        assert created[0]["collection_id"] == collection_id
+
+        listed = client.get(
+            "/prompts", params={"collection_id": collection_id}
+        ).json()
+        assert [p["id"] for p in listed["prompts"]] == [created[0]["id"]]
+
+    def test_create_prompts_batch_keeps_order_within_one_tick(
+        self, client: TestClient, monkeypatch
+    ):
+        frozen = datetime(2026, 1, 1)
+
+        class FrozenDatetime(datetime):
+            @classmethod
+            def utcnow(cls):
+                return frozen
+
+        monkeypatch.setattr(models, "datetime", FrozenDatetime)
+        titles = [f"Prompt {i}" for i in range(20)]
+        batch = {"prompts": [{"title": t, "content": "Content"} for t in titles]}
+
+        created = client.post("/prompts/batch", json=batch).json()
+        stamps = [datetime.fromisoformat(p["created_at"]) for p in created]
+        assert stamps == sorted(set(stamps))
+
+        listed = client.get("/prompts").json()["prompts"]
+        assert [p["title"] for p in listed] == titles[::-1]
+
+    @pytest.mark.parametrize("size", [0, 1001], ids=["empty", "over-limit"])
+    def test_create_prompts_batch_size_limits(self, client: TestClient, size):
+        batch = {"prompts": [{"title": "Title", "content": "Content"}] * size}
+        
+        response = client.post("/prompts/batch", json=batch)
+        assert response.status_code == 422
+        assert storage.get_all_prompts() == []
+
+    def test_create_prompts_batch_is_atomic(self, client: TestClient):
+        batch = {"prompts": [
+            {"title": "Valid", "content": "Content"},
+            {"title": "Orphan", "content": "Content", "collection_id": "missing"},
+        ]}
+
+        response = client.post("/prompts/batch", json=batch)
+        assert response.status_code == 400
+        assert client.get("/prompts").json()["prompts"] == []
+
+    @pytest.mark.parametrize(
+        "params",
+        [{}, {"search": "xyznone"}, {"collection_id": MISSING_ID}],
+        ids=["unfiltered", "search-no-match", "unknown-collection"],
+    )
+    def test_list_prompts_empty(self, client: TestClient, sample_prompt_data, params):
+        if params:
+            # Give the filter something to reject
+            client.post("/prompts", json=sample_prompt_data)
+        
+        response = client.get("/prompts", params=params)
         assert response.status_code == 200
-        data = response.json()
-        assert data["prompts"] == []
-        assert data["total"] == 0
+        assert response.json() == {"prompts": [], "total": 0, "next_cursor": None}
     
     def test_list_prompts_with_data(self, client: TestClient, sample_prompt_data):
         # Create a prompt first
@@ -48,45 +179,45 @@ class TestPrompts:
         assert len(data["prompts"]) == 1
         assert data["total"] == 1
     
-    def test_get_prompt_success(self, client: TestClient, sample_prompt_data):
-        # Create a prompt first
-        create_response = client.post("/prompts", json=sample_prompt_data)
-        prompt_id = create_response.json()["id"]
-        
-        response = client.get(f"/prompts/{prompt_id}")
+    def test_get_prompt_success(self, client: TestClient, created_prompt):
+        response = client.get(f"/prompts/{created_prompt.id}")
         assert response.status_code == 200
-        data = response.json()
-        assert data["id"] == prompt_id
+        assert Prompt.model_validate(response.json()) == created_prompt
     
-    def test_get_prompt_not_found(self, client: TestClient):
-        """Test that getting a non-existent prompt returns 404.
+    @PROMPT_ID_REQUESTS
+    def test_prompt_not_found(self, client: TestClient, method, body):
+        """Test that addressing a non-existent prompt returns 404.
         
-        NOTE: This test currently FAILS due to Bug #1!
-        The API returns 500 instead of 404.
+        NOTE: GET used to FAIL here due to Bug #1, returning 500
+        instead of 404.
         """
-        response = client.get("/prompts/nonexistent-id")
-        # This should be 404, but there's a bug...
-        assert response.status_code == 404  # Will fail until bug is fixed
+        response = client.request(method, f"/prompts/{MISSING_ID}", json=body)
+        assert response.status_code == 404
+
+    @PROMPT_ID_REQUESTS
+    def test_prompt_invalid_uuid(self, client: TestClient, method, body):
+        response = client.request(method, "/prompts/nonexistent-id", json=body)
+        assert response.status_code == 422
+
+    def test_get_prompt_uppercase_uuid(self, client: TestClient, created_prompt):
+        response = client.get(f"/prompts/{created_prompt.id.upper()}")
+        assert response.status_code == 200
+        assert response.json()["id"] == created_prompt.id
     
-    def test_delete_prompt(self, client: TestClient, sample_prompt_data):
-        # Create a prompt first
-        create_response = client.post("/prompts", json=sample_prompt_data)
-        prompt_id = create_response.json()["id"]
+    def test_delete_prompt(self, client: TestClient, created_prompt):
+        prompt_id = created_prompt.id
         
         # Delete it
         response = client.delete(f"/prompts/{prompt_id}")
         assert response.status_code == 204
+        assert response.content == b""
+        assert "content-type" not in response.headers
         
-        # Verify it's gone
-        get_response = client.get(f"/prompts/{prompt_id}")
-        # Note: This might fail due to Bug #1
-        assert get_response.status_code in [404, 500]  # 404 after fix
+        # Verify it's gone; the 404 itself is covered by test_prompt_not_found
+        assert storage.get_prompt(prompt_id) is None
     
-    def test_update_prompt(self, client: TestClient, sample_prompt_data):
-        # Create a prompt first
-        create_response = client.post("/prompts", json=sample_prompt_data)
-        prompt_id = create_response.json()["id"]
-        original_updated_at = create_response.json()["updated_at"]
+    def test_update_prompt(self, client: TestClient, created_prompt):
+        prompt_id = created_prompt.id
         
         # Update it
         updated_data = {
@@ -95,38 +226,145 @@ class TestPrompts:
             "description": "Updated description"
         }
         
-        import time
-        time.sleep(0.1)  # Small delay to ensure timestamp would change
-        
         response = client.put(f"/prompts/{prompt_id}", json=updated_data)
         assert response.status_code == 200
         data = response.json()
         assert data["title"] == "Updated Title"
         
-        # NOTE: This assertion will fail due to Bug #2!
-        # The updated_at should be different from original
-        # assert data["updated_at"] != original_updated_at  # Uncomment after fix
+        # The updated_at should be later than the original
+        assert datetime.fromisoformat(data["updated_at"]) > created_prompt.updated_at
     
-    def test_sorting_order(self, client: TestClient):
-        """Test that prompts are sorted newest first.
-        
-        NOTE: This test might fail due to Bug #3!
-        """
-        import time
+    def test_sorting_order(self, client: TestClient, seed_prompts):
+        """Test that prompts are sorted newest first."""
+        # seed_prompts gives each prompt a later created_at than the last
+        seed_prompts(
+            {"title": "First", "content": "First prompt content"},
+            {"title": "Second", "content": "Second prompt content"},
+            {"title": "Third", "content": "Third prompt content"},
+        )
         
-        # Create prompts with delay
-        prompt1 = {"title": "First", "content": "First prompt content"}
-        prompt2 = {"title": "Second", "content": "Second prompt content"}
-        
-        client.post("/prompts", json=prompt1)
-        time.sleep(0.1)
-        client.post("/prompts", json=prompt2)
+        prompts = client.get("/prompts").json()["prompts"]
+        assert [p["title"] for p in prompts] == ["Third", "Second", "First"]
+
+    def test_list_prompts_search(
+        self, client: TestClient, sample_prompt_data, seed_prompts
+    ):
+        seed_prompts(
+            sample_prompt_data,
+            {"title": "Summarizer", "content": "Summarize {{text}}"},
+        )
+
+        # Matches are case-insensitive and cover the description too
+        response = client.get("/prompts", params={"search": "AI CODE"})
+        titles = [p["title"] for p in response.json()["prompts"]]
+        assert titles == [sample_prompt_data["title"]]
+
+    def test_list_prompts_pagination(self, client: TestClient, seed_prompts):
+        seed_prompts(*(
+            {"title": title, "content": "Some content"}
+            for title in ["First", "Second", "Third"]
+        ))
+
+        first_page = client.get("/prompts", params={"limit": 2}).json()
+        assert [p["title"] for p in first_page["prompts"]] == ["Third", "Second"]
+        assert first_page["total"] == 3
+        assert first_page["next_cursor"] is not None
+
+        second_page = client.get(
+            "/prompts", params={"limit": 2, "cursor": first_page["next_cursor"]}
+        ).json()
+        assert [p["title"] for p in second_page["prompts"]] == ["First"]
+        assert second_page["next_cursor"] is None
+
+    def test_list_prompts_total_counts_all_matches(
+        self, client: TestClient, sample_collection_data, seed_prompts
+    ):
+        collection_id = client.post(
+            "/collections", json=sample_collection_data
+        ).json()["id"]
+        in_collection = {"content": "Content", "collection_id": collection_id}
+        seed_prompts(
+            {"title": "Review one", "content": "Content"},
+            {**in_collection, "title": "Review two"},
+            {**in_collection, "title": "Summary"},
+        )
+
+        cases = [
+            ({}, 3),
+            ({"search": "review"}, 2),
+            ({"collection_id": collection_id}, 2),
+            ({"collection_id": collection_id, "search": "review"}, 1),
+        ]
+        for params, total in cases:
+            page = client.get("/prompts", params={**params, "limit": 1}).json()
+            assert len(page["prompts"]) == 1
+            assert page["total"] == total
+
+    def test_list_prompts_etag_not_modified(
+        self, client: TestClient, sample_prompt_data
+    ):
+        first = client.get("/prompts")
+        etag = first.headers["etag"]
+        assert first.headers["cache-control"] == "no-cache"
+
+        unchanged = client.get("/prompts", headers={"If-None-Match": etag})
+        assert unchanged.status_code == 304
+        assert unchanged.content == b""
+
+        client.post("/prompts", json=sample_prompt_data)
+        changed = client.get("/prompts", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+        assert len(changed.json()["prompts"]) == 1
+
+    @pytest.mark.parametrize(
+        "header",
+        ["*", '"other", {etag}', "{strong}"],
+        ids=["wildcard", "list", "weak-compare"],
+    )
+    def test_list_prompts_if_none_match_forms(self, client: TestClient, header):
+        etag = client.get("/prompts").headers["etag"]
+        header = header.format(etag=etag, strong=etag.removeprefix("W/"))
         
-        response = client.get("/prompts")
-        prompts = response.json()["prompts"]
+        response = client.get("/prompts", headers={"If-None-Match": header})
+        assert response.status_code == 304
+
+    def test_list_prompts_invalid_cursor(self, client: TestClient):
+        response = client.get("/prompts", params={"cursor": "not-a-cursor"})
+        assert response.status_code == 400
+
+    @pytest.mark.parametrize("path", ["/prompts", "/collections"])
+    @pytest.mark.parametrize(
+        "raw",
+        ["2026-01-01T00:00:00+00:00|x", "2026-01-01T00:00:00|"],
+        ids=["tz-aware", "empty-id"],
+    )
+    def test_list_rejects_unusable_cursor(
+        self, client: TestClient, seed_prompts, path, raw
+    ):
+        """Well-formed cursors that cannot be compared to stored keys get 400."""
+        seed_prompts({"title": "Title", "content": "Content"})
+        client.post("/collections", json={"name": "Name"})
+        cursor = base64.urlsafe_b64encode(raw.encode()).decode("ascii")
         
-        # Newest (Second) should be first
-        assert prompts[0]["title"] == "Second"  # Will fail until Bug #3 fixed
+        response = client.get(path, params={"cursor": cursor})
+        assert response.status_code == 400
+
+    def test_list_prompts_follows_collection_change(
+        self, client: TestClient, sample_prompt_data
+    ):
+        first = client.post("/collections", json={"name": "First"}).json()["id"]
+        second = client.post("/collections", json={"name": "Second"}).json()["id"]
+        prompt = client.post(
+            "/prompts", json={**sample_prompt_data, "collection_id": first}
+        ).json()
+
+        client.patch(f"/prompts/{prompt['id']}", json={"collection_id": second})
+
+        old = client.get("/prompts", params={"collection_id": first}).json()
+        assert old["prompts"] == []
+        moved = client.get("/prompts", params={"collection_id": second}).json()
+        assert [p["id"] for p in moved["prompts"]] == [prompt["id"]]
 
 
 class TestCollections:
@@ -135,9 +373,23 @@ class TestCollections:
     def test_create_collection(self, client: TestClient, sample_collection_data):
         response = client.post("/collections", json=sample_collection_data)
         assert response.status_code == 201
-        data = response.json()
-        assert data["name"] == sample_collection_data["name"]
-        assert "id" in data
+        collection = Collection.model_validate(response.json())
+        assert collection.name == sample_collection_data["name"]
+    
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            {},
+            {"name": ""},
+            {"name": "x" * 101},
+            {"name": "Name", "description": "x" * 501},
+        ],
+        ids=["no-name", "empty-name", "long-name", "long-description"],
+    )
+    def test_create_collection_invalid_payload(self, client: TestClient, payload):
+        response = client.post("/collections", json=payload)
+        assert response.status_code == 422
+        assert storage.get_all_collections() == []
     
     def test_list_collections(self, client: TestClient, sample_collection_data):
         client.post("/collections", json=sample_collection_data)
@@ -147,17 +399,41 @@ class TestCollections:
         data = response.json()
         assert len(data["collections"]) == 1
     
-    def test_get_collection_not_found(self, client: TestClient):
-        response = client.get("/collections/nonexistent-id")
+    def test_list_collections_reflects_new_collection(
+        self, client: TestClient, sample_collection_data
+    ):
+        client.post("/collections", json=sample_collection_data)
+        assert client.get("/collections").json()["total"] == 1
+
+        client.post("/collections", json={"name": "Writing"})
+        assert client.get("/collections").json()["total"] == 2
+
+    def test_list_collections_pagination(self, client: TestClient):
+        for name in ["First", "Second", "Third"]:
+            client.post("/collections", json={"name": name})
+
+        first_page = client.get("/collections", params={"limit": 2}).json()
+        assert [c["name"] for c in first_page["collections"]] == ["First", "Second"]
+        assert first_page["total"] == 3
+
+        second_page = client.get(
+            "/collections", params={"limit": 2, "cursor": first_page["next_cursor"]}
+        ).json()
+        assert [c["name"] for c in second_page["collections"]] == ["Third"]
+        assert second_page["next_cursor"] is None
+
+    @COLLECTION_ID_REQUESTS
+    def test_collection_not_found(self, client: TestClient, method):
+        response = client.request(method, f"/collections/{MISSING_ID}")
         assert response.status_code == 404
+
+    @COLLECTION_ID_REQUESTS
+    def test_collection_invalid_uuid(self, client: TestClient, method):
+        response = client.request(method, "/collections/nonexistent-id")
+        assert response.status_code == 422
     
     def test_delete_collection_with_prompts(self, client: TestClient, sample_collection_data, sample_prompt_data):
-        """Test deleting a collection that has prompts.
-        
-        NOTE: Bug #4 - prompts become orphaned after collection deletion.
-        This test documents the current (buggy) behavior.
-        After fixing, update the test to verify correct behavior.
-        """
+        """Deleting a collection also deletes the prompts it contains."""
         # Create collection
         col_response = client.post("/collections", json=sample_collection_data)
         collection_id = col_response.json()["id"]
@@ -168,12 +444,9 @@ class TestCollections:
         prompt_id = prompt_response.json()["id"]
         
         # Delete collection
-        client.delete(f"/collections/{collection_id}")
+        response = client.delete(f"/collections/{collection_id}")
+        assert response.status_code == 204
         
-        # The prompt still exists but has invalid collection_id
-        # This is Bug #4 - should be handled properly
-        prompts = client.get("/prompts").json()["prompts"]
-        if prompts:
-            # Prompt exists with orphaned collection_id
-            assert prompts[0]["collection_id"] == collection_id
-            # After fix, collection_id should be None or prompt should be deleted
+        # Check the cascade against storage; the 404s are covered elsewhere
+        assert storage.get_collection(collection_id) is None
+        assert storage.get_prompt(prompt_id) is None
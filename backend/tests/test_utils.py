@@ -0,0 +1,108 @@
+"""Unit tests for the PromptLab utility helpers
+
+These tests exercise the pure functions in ``app.utils`` directly,
+without going through the API.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from app.models import Prompt
+from app.utils import (
+    extract_variables,
+    filter_prompts_by_collection,
+    iter_prompts_by_collection,
+    iter_variables,
+    newest_prompts,
+    sort_prompts_by_date,
+)
+
+
+START = datetime(2026, 1, 1)
+
+
+def make_prompts(*offsets):
+    """Build prompts created ``offset`` seconds after ``START``, in order."""
+    return [
+        Prompt(
+            title=f"Prompt {i}",
+            content="Some content",
+            created_at=START + timedelta(seconds=offset),
+        )
+        for i, offset in enumerate(offsets)
+    ]
+
+
+class TestNewestPrompts:
+    """Tests for newest_prompts."""
+
+    @pytest.mark.parametrize(
+        "offsets",
+        [(3, 1, 4, 1, 5, 9, 2, 6), (0, 2, 2, 1, 2, 0)],
+        ids=["distinct", "ties"],
+    )
+    @pytest.mark.parametrize("count", [0, 1, 3, 100])
+    def test_matches_sorted_slice(self, offsets, count):
+        prompts = make_prompts(*offsets)
+        expected = sort_prompts_by_date(prompts)[:count]
+        assert newest_prompts(prompts, count) == expected
+
+    def test_accepts_any_iterable(self):
+        prompts = make_prompts(1, 3, 2)
+        assert newest_prompts(iter(prompts), 2) == [prompts[1], prompts[2]]
+
+
+class TestIterPromptsByCollection:
+    """Tests for iter_prompts_by_collection."""
+
+    @pytest.mark.parametrize("collection_id", ["a", "b", "missing"])
+    def test_matches_filter_prompts_by_collection(self, collection_id):
+        prompts = [
+            prompt.model_copy(update={"collection_id": owner})
+            for prompt, owner in zip(
+                make_prompts(0, 1, 2, 3, 4), ["a", None, "b", "a", None]
+            )
+        ]
+        expected = filter_prompts_by_collection(prompts, collection_id)
+        assert list(iter_prompts_by_collection(prompts, collection_id)) == expected
+
+    def test_is_lazy(self):
+        prompts = [
+            prompt.model_copy(update={"collection_id": "a"})
+            for prompt in make_prompts(0, 1)
+        ]
+        consumed = iter(prompts)
+        matches = iter_prompts_by_collection(consumed, "a")
+        assert next(matches) is prompts[0]
+        assert next(consumed) is prompts[1]
+
+
+class TestExtractVariables:
+    """Tests for extract_variables."""
+
+    def test_mutating_result_does_not_corrupt_cache(self):
+        content = "Hello {{name}}, welcome to {{place}}!"
+        first = extract_variables(content)
+        first.append("injected")
+        first[0] = "changed"
+
+        second = extract_variables(content)
+        assert second == ["name", "place"]
+        assert second is not first
+
+
+class TestIterVariables:
+    """Tests for iter_variables."""
+
+    @pytest.mark.parametrize(
+        "content",
+        [
+            "No variables here.",
+            "Hello {{name}}, welcome to {{place}}!",
+            "{{x}} and {{x}} again",
+            "{{ spaced }} {not} {{ok_1}}{{b}}",
+        ],
+        ids=["none", "two", "repeated", "mixed"],
+    )
+    def test_matches_extract_variables(self, content):
+        assert list(iter_variables(content)) == extract_variables(content)